@@ -41,6 +41,7 @@ class TestVectors(TorchtextTestCase):
         vecs = torch.stack((tensorA, tensorB), 0)
         vectors_obj = build_vectors(tokens, vecs, unk_tensor=unk_tensor)
 
+        self.assertEqual(len(vectors_obj), 2)
         self.assertEqual(vectors_obj["a"], tensorA)
         self.assertEqual(vectors_obj["b"], tensorB)
         self.assertEqual(vectors_obj["not_in_it"], unk_tensor)
@@ -1,13 +1,16 @@
 import os
 import platform
+import re
 import shutil
 import tempfile
 import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from unittest.mock import patch
 
 import torch
 from torch.utils.data import DataLoader
-from torchtext.data.functional import custom_replace
 from torchtext.prototype.transforms import (
     basic_english_normalize,
     PRETRAINED_SP_MODEL,
@@ -15,7 +18,7 @@ from torchtext.prototype.transforms import (
     sentencepiece_tokenizer,
     VocabTransform,
 )
-from torchtext.prototype.vectors import build_vectors, FastText, GloVe, load_vectors_from_file_path
+from torchtext.prototype.vectors import _zip_archives, build_vectors, FastText, GloVe, load_vectors_from_file_path
 from torchtext.prototype.vocab_factory import build_vocab_from_text_file, load_vocab_from_file
 from torchtext.utils import download_from_url
 from torchtext_unittest.common.torchtext_test_case import TorchtextTestCase
@@ -23,20 +26,87 @@ from torchtext_unittest.common.torchtext_test_case import TorchtextTestCase
 from ..common.assets import get_asset_path
 
 
+# Python equivalent of basic_english_normalize: a single alternation applied in one pass, where the index of
+# the matched group selects the replacement
+_BASIC_ENGLISH_NORMALIZE_PATTERN = re.compile(r"(')|(\")|(\.)|(<br \/>)|(,)|(\()|(\))|(!)|(\?)|([;:])|(\s+)")
+_BASIC_ENGLISH_NORMALIZE_REPLACEMENTS = [" '  ", "", " . ", " ", " , ", " ( ", " ) ", " ! ", " ? ", " ", " "]
+
+
+# Expected vocabularies of vocab_test.txt and of vocab_raw_text_test.txt tokenized with basic_english_normalize
+_EXPECTED_ITOS_SMALL = ["b", "a", "c"]
+_EXPECTED_STOI_SMALL = {x: index for index, x in enumerate(_EXPECTED_ITOS_SMALL)}
+_EXPECTED_ITOS_RAW = [
+    "'",
+    "after",
+    "talks",
+    ".",
+    "are",
+    "at",
+    "disappointed",
+    "fears",
+    "federal",
+    "firm",
+    "for",
+    "mogul",
+    "n",
+    "newall",
+    "parent",
+    "pension",
+    "representing",
+    "say",
+    "stricken",
+    "t",
+    "they",
+    "turner",
+    "unions",
+    "with",
+    "workers",
+]
+_EXPECTED_STOI_RAW = {x: index for index, x in enumerate(_EXPECTED_ITOS_RAW)}
+
+
+def _as_tensors(expected_vectors):
+    # convert the expected vectors once, so that comparisons don't turn a python list into a tensor on every call
+    return {word: torch.tensor(vector, dtype=torch.float32) for word, vector in expected_vectors.items()}
+
+
 # Windows and MaxOS doesn't support the nested function pickle
 # Move the batch function out of the test_sentencepiece_with_dataloader test
 def _batch_func(spm_processor, data):
-    return torch.tensor([spm_processor(text) for text in data], dtype=torch.long)
+    return torch.as_tensor(spm_processor.batch_encode(list(data)), dtype=torch.long)
 
 
 class TestTransformsWithAsset(TorchtextTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls._sp_model_dir = tempfile.mkdtemp()
+        cls._sp_model_paths = {}
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls._sp_model_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def _get_sp_model_path(cls, name) -> str:
+        # download a pretrained sentencepiece model on first use and share it across the tests of this class, so
+        # that only the tests which need it depend on the network
+        if name not in cls._sp_model_paths:
+            cls._sp_model_paths[name] = download_from_url(PRETRAINED_SP_MODEL[name], root=cls._sp_model_dir)
+        return cls._sp_model_paths[name]
+
     def test_vocab_transform(self) -> None:
         asset_name = "vocab_test2.txt"
         asset_path = get_asset_path(asset_name)
         vocab_transform = VocabTransform(load_vocab_from_file(asset_path))
         self.assertEqual(vocab_transform(["of", "that", "new"]), [7, 18, 24])
+        self.assertEqual(vocab_transform.forward_list(["of", "that", "new"]), [7, 18, 24])
+        self.assertEqual(vocab_transform.forward_str("that"), 18)
         jit_vocab_transform = torch.jit.script(vocab_transform)
         self.assertEqual(jit_vocab_transform(["of", "that", "new", "that"]), [7, 18, 24, 18])
+        self.assertEqual(jit_vocab_transform.forward_list(["of", "that", "new", "that"]), [7, 18, 24, 18])
+        self.assertEqual(jit_vocab_transform.forward_str("new"), 24)
 
     def test_errors_vectors_python(self) -> None:
         tokens = []
@@ -55,87 +125,123 @@ class TestTransformsWithAsset(TorchtextTestCase):
             # Test proper error raised when vector is not of type torch.float
             build_vectors(tokens, vecs)
 
-        with tempfile.TemporaryDirectory() as dir_name:
-            # Test proper error raised when incorrect filename or dim passed into GloVe
-            asset_name = "glove.6B.zip"
-            asset_path = get_asset_path(asset_name)
-            data_path = os.path.join(dir_name, asset_name)
-            shutil.copy(asset_path, data_path)
+        # Test proper error raised when incorrect filename or dim passed into GloVe
+        with self.assertRaises(ValueError):
+            # incorrect name
+            GloVe(name="UNK", dim=50, root=self.test_dir, validate_file=False)
+
+        with self.assertRaises(ValueError):
+            # incorrect dim
+            GloVe(name="6B", dim=500, root=self.test_dir, validate_file=False)
+
+    def test_glove_unsafe_archive_member(self) -> None:
+        # members escaping root through ".." components or an absolute path must not be extracted
+        root = os.path.join(self.test_dir, "root")
+        os.makedirs(root)
+        unsafe_members = [
+            os.path.join("..", "glove.6B.50d.txt"),
+            os.path.join(os.path.abspath(self.test_dir), "abs", "glove.6B.50d.txt"),
+        ]
+        for i, member in enumerate(unsafe_members):
+            archive_path = os.path.join(self.test_dir, "unsafe_{}.zip".format(i))
+            with zipfile.ZipFile(archive_path, "w") as zfile:
+                zfile.writestr(member, "the 0.418 0.24968 -0.41242\n")
 
             with self.assertRaises(ValueError):
-                # incorrect name
-                GloVe(name="UNK", dim=50, root=dir_name, validate_file=False)
+                GloVe(name="6B", dim=50, root=root, validate_file=False, file_path=archive_path)
 
-            with self.assertRaises(ValueError):
-                # incorrect dim
-                GloVe(name="6B", dim=500, root=dir_name, validate_file=False)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "glove.6B.50d.txt")))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "abs")))
 
     def test_glove(self) -> None:
-        # copy the asset file into the expected download location
+        # read the asset file in place and extract it into the test directory
         # note that this is just a zip file with the first 100 entries of the GloVe 840B dataset
         asset_name = "glove.840B.300d.zip"
         asset_path = get_asset_path(asset_name)
 
-        with tempfile.TemporaryDirectory() as dir_name:
-            data_path = os.path.join(dir_name, asset_name)
-            shutil.copy(asset_path, data_path)
-            vectors_obj = GloVe(root=dir_name, validate_file=False)
-            jit_vectors_obj = torch.jit.script(vectors_obj)
+        vectors_obj = GloVe(root=self.test_dir, validate_file=False, file_path=asset_path)
+        jit_vectors_obj = torch.jit.script(vectors_obj)
 
-            # The first 3 entries in each vector.
-            expected_glove = {
+        # The first 3 entries in each vector.
+        expected_glove = _as_tensors(
+            {
                 "the": [0.27204, -0.06203, -0.1884],
                 "people": [-0.19686, 0.11579, -0.41091],
             }
+        )
 
-            for word in expected_glove.keys():
-                self.assertEqual(vectors_obj[word][:3], expected_glove[word])
-                self.assertEqual(jit_vectors_obj[word][:3], expected_glove[word])
+        for word in expected_glove.keys():
+            self.assertEqual(vectors_obj[word][:3], expected_glove[word], atol=1e-5, rtol=0)
+            self.assertEqual(jit_vectors_obj[word][:3], expected_glove[word], atol=1e-5, rtol=0)
+
+    def test_glove_binary_cache(self) -> None:
+        asset_name = "glove.840B.300d.zip"
+        asset_path = get_asset_path(asset_name)
+
+        # the first load parses the text file and writes the binary cache, the second one memory-maps it
+        vectors_obj = GloVe(root=self.test_dir, validate_file=False, binary_cache=True, file_path=asset_path)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "glove.840B.300d.txt.bin")))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "glove.840B.300d.txt.vocab.txt")))
+        # the rows start at an aligned offset
+        with open(os.path.join(self.test_dir, "glove.840B.300d.txt.bin"), "rb") as f:
+            self.assertEqual(len(f.readline()) % 64, 0)
+        # the text parser must not run again once the cache exists
+        with patch(
+            "torchtext.prototype.vectors._load_token_and_vectors_from_file",
+            side_effect=AssertionError("the binary cache was not used"),
+        ):
+            cached_vectors_obj = GloVe(root=self.test_dir, validate_file=False, binary_cache=True, file_path=asset_path)
+        jit_cached_vectors_obj = torch.jit.script(cached_vectors_obj)
+
+        self.assertEqual(len(cached_vectors_obj.vectors.get_stoi()), len(vectors_obj.vectors.get_stoi()))
+        for word in ["the", "people", "not_in_it"]:
+            self.assertEqual(cached_vectors_obj[word], vectors_obj[word])
+            self.assertEqual(jit_cached_vectors_obj[word], vectors_obj[word])
 
     def test_glove_different_dims(self) -> None:
-        # copy the asset file into the expected download location
+        # read the asset file in place and extract it into the test directory
         # note that this is just a zip file with 1 line txt files used to test that the
         # correct files are being loaded
         asset_name = "glove.6B.zip"
         asset_path = get_asset_path(asset_name)
 
-        with tempfile.TemporaryDirectory() as dir_name:
-            data_path = os.path.join(dir_name, asset_name)
-            shutil.copy(asset_path, data_path)
-
-            glove_50d = GloVe(name="6B", dim=50, root=dir_name, validate_file=False)
-            glove_100d = GloVe(name="6B", dim=100, root=dir_name, validate_file=False)
-            glove_200d = GloVe(name="6B", dim=200, root=dir_name, validate_file=False)
-            glove_300d = GloVe(name="6B", dim=300, root=dir_name, validate_file=False)
-            vectors_objects = [glove_50d, glove_100d, glove_200d, glove_300d]
-
-            # The first 3 entries in each vector.
-            expected_glove_50d = {
-                "the": [0.418, 0.24968, -0.41242],
-            }
-            expected_glove_100d = {
-                "the": [-0.038194, -0.24487, 0.72812],
-            }
-            expected_glove_200d = {
-                "the": [-0.071549, 0.093459, 0.023738],
-            }
-            expected_glove_300d = {
-                "the": [0.04656, 0.21318, -0.0074364],
-            }
-            expected_gloves = [expected_glove_50d, expected_glove_100d, expected_glove_200d, expected_glove_300d]
+        def load_glove(dim):
+            return GloVe(name="6B", dim=dim, root=self.test_dir, validate_file=False, file_path=asset_path)
+
+        # each dim is extracted and parsed independently, load them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            vectors_objects = list(executor.map(load_glove, [50, 100, 200, 300]))
+        # the shared archive is closed once the loads are done
+        self.assertEqual(_zip_archives, {})
+
+        # The first 3 entries in each vector.
+        expected_glove_50d = {
+            "the": [0.418, 0.24968, -0.41242],
+        }
+        expected_glove_100d = {
+            "the": [-0.038194, -0.24487, 0.72812],
+        }
+        expected_glove_200d = {
+            "the": [-0.071549, 0.093459, 0.023738],
+        }
+        expected_glove_300d = {
+            "the": [0.04656, 0.21318, -0.0074364],
+        }
+        expected_gloves = [
+            _as_tensors(expected_glove)
+            for expected_glove in [expected_glove_50d, expected_glove_100d, expected_glove_200d, expected_glove_300d]
+        ]
 
-            for vectors_obj, expected_glove in zip(vectors_objects, expected_gloves):
-                for word in expected_glove.keys():
-                    self.assertEqual(vectors_obj[word][:3], expected_glove[word])
+        for vectors_obj, expected_glove in zip(vectors_objects, expected_gloves):
+            for word in expected_glove.keys():
+                self.assertEqual(vectors_obj[word][:3], expected_glove[word], atol=1e-5, rtol=0)
 
     def test_vocab_from_file(self) -> None:
         asset_name = "vocab_test.txt"
         asset_path = get_asset_path(asset_name)
         v = load_vocab_from_file(asset_path)
-        expected_itos = ["b", "a", "c"]
-        expected_stoi = {x: index for index, x in enumerate(expected_itos)}
-        self.assertEqual(v.get_itos(), expected_itos)
-        self.assertEqual(dict(v.get_stoi()), expected_stoi)
+        self.assertEqual(len(v), len(_EXPECTED_ITOS_SMALL))
+        self.assertEqual(v.lookup_indices(list(_EXPECTED_STOI_SMALL)), list(_EXPECTED_STOI_SMALL.values()))
 
     # TODO(Nayef211): remove decorator once https://github.com/pytorch/text/issues/1900 is closed
     @unittest.skipIf("CI" in os.environ and platform.system() == "Linux", "Test is known to fail on Linux.")
@@ -144,78 +250,32 @@ class TestTransformsWithAsset(TorchtextTestCase):
         asset_path = get_asset_path(asset_name)
 
         def python_basic_english_normalize(input):
-            patterns_list = [
-                (r"\'", " '  "),
-                (r"\"", ""),
-                (r"\.", " . "),
-                (r"<br \/>", " "),
-                (r",", " , "),
-                (r"\(", " ( "),
-                (r"\)", " ) "),
-                (r"\!", " ! "),
-                (r"\?", " ? "),
-                (r"\;", " "),
-                (r"\:", " "),
-                (r"\s+", " "),
-            ]
-            norm_transform = custom_replace(patterns_list)
-            return list(norm_transform([input.lower()]))[0].split()
+            return _BASIC_ENGLISH_NORMALIZE_PATTERN.sub(
+                lambda m: _BASIC_ENGLISH_NORMALIZE_REPLACEMENTS[m.lastindex - 1], input.lower()
+            ).split()
 
         # using python based basic_english_normalize tokenizer
         # we can also use basic_english_normalize() here
         v1 = build_vocab_from_text_file(asset_path, tokenizer=python_basic_english_normalize)
-        expected_itos = [
-            "'",
-            "after",
-            "talks",
-            ".",
-            "are",
-            "at",
-            "disappointed",
-            "fears",
-            "federal",
-            "firm",
-            "for",
-            "mogul",
-            "n",
-            "newall",
-            "parent",
-            "pension",
-            "representing",
-            "say",
-            "stricken",
-            "t",
-            "they",
-            "turner",
-            "unions",
-            "with",
-            "workers",
-        ]
-        expected_stoi = {x: index for index, x in enumerate(expected_itos)}
-        self.assertEqual(v1.get_itos(), expected_itos)
-        self.assertEqual(dict(v1.get_stoi()), expected_stoi)
+        self.assertEqual(len(v1), len(_EXPECTED_ITOS_RAW))
+        self.assertEqual(v1.lookup_indices(list(_EXPECTED_STOI_RAW)), list(_EXPECTED_STOI_RAW.values()))
 
         # using JIT'D basic_english_normalize tokenizer
         v2 = build_vocab_from_text_file(asset_path, tokenizer=torch.jit.script(basic_english_normalize()))
-        self.assertEqual(v2.get_itos(), expected_itos)
-        self.assertEqual(dict(v2.get_stoi()), expected_stoi)
+        self.assertEqual(len(v2), len(_EXPECTED_ITOS_RAW))
+        self.assertEqual(v2.lookup_indices(list(_EXPECTED_STOI_RAW)), list(_EXPECTED_STOI_RAW.values()))
 
     def test_builtin_pretrained_sentencepiece_processor(self) -> None:
-        sp_model_path = download_from_url(PRETRAINED_SP_MODEL["text_unigram_25000"])
-        spm_tokenizer = sentencepiece_tokenizer(sp_model_path)
-        _path = os.path.join(self.project_root, ".data", "text_unigram_25000.model")
-        os.remove(_path)
+        spm_tokenizer = sentencepiece_tokenizer(self._get_sp_model_path("text_unigram_25000"))
         test_sample = "the pretrained spm model names"
         ref_results = ["\u2581the", "\u2581pre", "trained", "\u2581sp", "m", "\u2581model", "\u2581names"]
         self.assertEqual(spm_tokenizer(test_sample), ref_results)
 
-        sp_model_path = download_from_url(PRETRAINED_SP_MODEL["text_bpe_25000"])
-        spm_transform = sentencepiece_processor(sp_model_path)
-        _path = os.path.join(self.project_root, ".data", "text_bpe_25000.model")
-        os.remove(_path)
+        spm_transform = sentencepiece_processor(self._get_sp_model_path("text_bpe_25000"))
         test_sample = "the pretrained spm model names"
         ref_results = [13, 1465, 12824, 304, 24935, 5771, 3776]
         self.assertEqual(spm_transform(test_sample), ref_results)
+        self.assertEqual(spm_transform.batch_encode([test_sample, test_sample]), [ref_results, ref_results])
 
     # we separate out these errors because Windows runs into seg faults when propagating
     # exceptions from C++ using pybind11
@@ -223,14 +283,18 @@ class TestTransformsWithAsset(TorchtextTestCase):
         example_strings = ["the pretrained spm model names"] * 64
         ref_results = torch.tensor([[13, 1465, 12824, 304, 24935, 5771, 3776]] * 16, dtype=torch.long)
 
-        sp_model_path = download_from_url(PRETRAINED_SP_MODEL["text_bpe_25000"])
-        spm_processor = sentencepiece_processor(sp_model_path)
+        spm_processor = sentencepiece_processor(self._get_sp_model_path("text_bpe_25000"))
         batch_fn = partial(_batch_func, spm_processor)
 
-        dataloader = DataLoader(example_strings, batch_size=16, num_workers=2, collate_fn=batch_fn)
+        dataloader = DataLoader(example_strings, batch_size=16, num_workers=0, collate_fn=batch_fn)
         for item in dataloader:
             self.assertEqual(item, ref_results)
 
+        # the collate function still has to be picklable for the worker processes
+        dataloader = DataLoader(example_strings[:4], batch_size=2, num_workers=2, collate_fn=batch_fn)
+        for item in dataloader:
+            self.assertEqual(item, ref_results[:2])
+
     def test_vectors_from_file(self) -> None:
         asset_name = "vectors_test.csv"
         asset_path = get_asset_path(asset_name)
@@ -244,24 +308,54 @@ class TestTransformsWithAsset(TorchtextTestCase):
         self.assertEqual(vectors_obj["b"], expected_tensorB)
         self.assertEqual(vectors_obj["not_in_it"], expected_unk_tensor)
 
+    # we separate out these errors because Windows runs into seg faults when propagating
+    # exceptions from C++ using pybind11
+    @unittest.skipIf(platform.system() == "Windows", "Test is known to fail on Windows.")
+    def test_vectors_from_file_short_row(self) -> None:
+        # the error raised by the thread parsing the short row must reach the caller instead of hanging the loader
+        file_path = os.path.join(self.test_dir, "vectors_short_row.csv")
+        with open(file_path, "w") as f:
+            f.write("a,1 0 0\nb,0 1\n")
+
+        with self.assertRaises(RuntimeError):
+            load_vectors_from_file_path(file_path)
+
     def test_fast_text(self) -> None:
-        # copy the asset file into the expected download location
+        # read the asset file in place
         # note that this is just a file with the first 100 entries of the FastText english dataset
         asset_name = "wiki.en.vec"
         asset_path = get_asset_path(asset_name)
 
-        with tempfile.TemporaryDirectory() as dir_name:
-            data_path = os.path.join(dir_name, asset_name)
-            shutil.copy(asset_path, data_path)
-            vectors_obj = FastText(root=dir_name, validate_file=False)
-            jit_vectors_obj = torch.jit.script(vectors_obj)
+        vectors_obj = FastText(validate_file=False, file_path=asset_path)
+        jit_vectors_obj = torch.jit.script(vectors_obj)
 
-            # The first 3 entries in each vector.
-            expected_fasttext_simple_en = {
+        # The first 3 entries in each vector.
+        expected_fasttext_simple_en = _as_tensors(
+            {
                 "the": [-0.065334, -0.093031, -0.017571],
                 "world": [-0.32423, -0.098845, -0.0073467],
             }
+        )
+
+        for word in expected_fasttext_simple_en.keys():
+            self.assertEqual(vectors_obj[word][:3], expected_fasttext_simple_en[word], atol=1e-5, rtol=0)
+            self.assertEqual(jit_vectors_obj[word][:3], expected_fasttext_simple_en[word], atol=1e-5, rtol=0)
+
+    def test_fast_text_binary_cache(self) -> None:
+        asset_name = "wiki.en.vec"
+        asset_path = get_asset_path(asset_name)
 
-            for word in expected_fasttext_simple_en.keys():
-                self.assertEqual(vectors_obj[word][:3], expected_fasttext_simple_en[word])
-                self.assertEqual(jit_vectors_obj[word][:3], expected_fasttext_simple_en[word])
+        # the cache of a file read in place is written to root, not next to the file
+        vectors_obj = FastText(root=self.test_dir, validate_file=False, binary_cache=True, file_path=asset_path)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "wiki.en.vec.bin")))
+        self.assertFalse(os.path.exists(asset_path + ".bin"))
+        with patch(
+            "torchtext.prototype.vectors._load_token_and_vectors_from_file",
+            side_effect=AssertionError("the binary cache was not used"),
+        ):
+            cached_vectors_obj = FastText(
+                root=self.test_dir, validate_file=False, binary_cache=True, file_path=asset_path
+            )
+
+        for word in ["the", "world", "not_in_it"]:
+            self.assertEqual(cached_vectors_obj[word], vectors_obj[word])
@@ -111,6 +111,23 @@ class TestVocab(TorchtextTestCase):
 
         self.assertEqual(len(v), 3)
 
+    def test_vocab_iter(self) -> None:
+        token_to_freq = {"hello": 4, "world": 3, "ᑌᑎIᑕOᗪᕮ_Tᕮ᙭T": 5, "freq_too_low": 2}
+        sorted_by_freq_tuples = sorted(token_to_freq.items(), key=lambda x: x[1], reverse=True)
+        c = OrderedDict(sorted_by_freq_tuples)
+        v = vocab(c, min_freq=3)
+
+        expected_itos = ["ᑌᑎIᑕOᗪᕮ_Tᕮ᙭T", "hello", "world"]
+        self.assertEqual(list(v), expected_itos)
+        self.assertEqual(list(v.__prepare_scriptable__()), expected_itos)
+        self.assertEqual(next(iter(v)), expected_itos[0])
+
+        it = iter(v)
+        next(it)
+        v.append_token("new")
+        with self.assertRaises(RuntimeError):
+            next(it)
+
     def test_vocab_basic(self) -> None:
         token_to_freq = {"hello": 4, "world": 3, "ᑌᑎIᑕOᗪᕮ_Tᕮ᙭T": 5, "freq_too_low": 2}
         sorted_by_freq_tuples = sorted(token_to_freq.items(), key=lambda x: x[1], reverse=True)
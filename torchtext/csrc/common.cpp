@@ -11,14 +11,37 @@ int64_t divup(int64_t x, int64_t y) {
   return (x + y - 1) / y;
 }
 
+// Files are read sequentially in binary mode through a large stream buffer,
+// which cuts the number of read syscalls and skips newline translation.
+constexpr size_t READ_BUFFER_SIZE = 1 << 20;
+
+void open_buffered_file(
+    std::ifstream& fin,
+    std::vector<char>& buffer,
+    const std::string& file_path) {
+  buffer.resize(READ_BUFFER_SIZE);
+#ifdef _MSC_VER
+  // the MSVC filebuf hands the buffer to setvbuf, which needs an open file
+  fin.open(file_path, std::ios::in | std::ios::binary);
+  fin.rdbuf()->pubsetbuf(buffer.data(), buffer.size());
+#else
+  // libstdc++ ignores the buffer once a file is open, libc++ takes it either
+  // way as long as nothing was read yet
+  fin.rdbuf()->pubsetbuf(buffer.data(), buffer.size());
+  fin.open(file_path, std::ios::in | std::ios::binary);
+#endif
+}
+
 void infer_offsets(
     const std::string& file_path,
     int64_t num_lines,
     int64_t chunk_size,
     std::vector<size_t>& offsets,
     int64_t num_header_lines) {
+  // declared before the stream so that it outlives it
+  std::vector<char> buffer;
   std::ifstream fin;
-  fin.open(file_path, std::ios::in);
+  open_buffered_file(fin, buffer, file_path);
 
   while (num_header_lines > 0) {
     fin.ignore(std::numeric_limits<std::streamsize>::max(), '\n');
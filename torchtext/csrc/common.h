@@ -1,6 +1,7 @@
 #include <torchtext/csrc/export.h>
 
 #include <cstdint>
+#include <fstream>
 #include <string>
 #include <vector>
 
@@ -8,6 +9,10 @@ namespace torchtext {
 
 namespace impl {
 TORCHTEXT_API int64_t divup(int64_t x, int64_t y);
+TORCHTEXT_API void open_buffered_file(
+    std::ifstream& fin,
+    std::vector<char>& buffer,
+    const std::string& file_path);
 TORCHTEXT_API void infer_offsets(
     const std::string& file_path,
     int64_t num_lines,
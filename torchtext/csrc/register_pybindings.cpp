@@ -29,6 +29,15 @@ Vocab build_vocab_from_text_file(
   torch::jit::script::Module module(*torch::jit::as_module(fn));
   return _build_vocab_from_text_file(file_path, min_freq, num_cpus, module);
 }
+
+// Iterates over the tokens of a vocab by index, converting one token at a time
+// instead of copying itos_. The size is checked on every step, so that adding
+// tokens while iterating raises instead of reading from a reallocated list.
+struct VocabIterator {
+  c10::intrusive_ptr<Vocab> vocab;
+  size_t index;
+  size_t size;
+};
 } // namespace
 
 // Registers our custom classes with pybind11.
@@ -75,6 +84,7 @@ PYBIND11_MODULE(_torchtext, m) {
           [](const SentencePiece& self) { return py::bytes(self.content_); })
       .def("Encode", &SentencePiece::Encode)
       .def("EncodeAsIds", &SentencePiece::EncodeAsIds)
+      .def("BatchEncodeAsIds", &SentencePiece::BatchEncodeAsIds)
       .def("DecodeIds", &SentencePiece::DecodeIds)
       .def("EncodeAsPieces", &SentencePiece::EncodeAsPieces)
       .def("DecodePieces", &SentencePiece::DecodePieces)
@@ -155,6 +165,11 @@ PYBIND11_MODULE(_torchtext, m) {
           })
       .def("get_stoi", &Vocab::get_stoi)
       .def("get_itos", &Vocab::get_itos)
+      .def(
+          "__iter__",
+          [](const c10::intrusive_ptr<Vocab>& self) {
+            return VocabIterator{self, 0, self->itos_.size()};
+          })
       .def(py::pickle(
           // __getstate__
           [](const c10::intrusive_ptr<Vocab>& self) -> VocabStates {
@@ -165,6 +180,21 @@ PYBIND11_MODULE(_torchtext, m) {
             return _deserialize_vocab(states);
           }));
 
+  py::class_<VocabIterator>(m, "_VocabIterator")
+      .def(
+          "__iter__",
+          [](VocabIterator& self) -> VocabIterator& { return self; },
+          py::return_value_policy::reference_internal)
+      .def("__next__", [](VocabIterator& self) -> std::string {
+        if (self.vocab->itos_.size() != self.size) {
+          throw std::runtime_error("Vocab changed size during iteration");
+        }
+        if (self.index >= self.size) {
+          throw py::stop_iteration();
+        }
+        return self.vocab->itos_[self.index++];
+      });
+
   py::class_<GPT2BPEEncoder, c10::intrusive_ptr<GPT2BPEEncoder>>(
       m, "GPT2BPEEncoder")
       .def(py::init<
@@ -281,8 +311,12 @@ PYBIND11_MODULE(_torchtext, m) {
           }));
 
   // Functions
+  // the vectors file is parsed without touching python objects, release the
+  // GIL so that several files can be loaded concurrently from python threads
   m.def(
-      "_load_token_and_vectors_from_file", &_load_token_and_vectors_from_file);
+      "_load_token_and_vectors_from_file",
+      &_load_token_and_vectors_from_file,
+      py::call_guard<py::gil_scoped_release>());
   m.def("_load_vocab_from_file", &_load_vocab_from_file);
   m.def("_build_vocab_from_text_file", &build_vocab_from_text_file);
   m.def(
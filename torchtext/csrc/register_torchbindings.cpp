@@ -46,6 +46,7 @@ TORCH_LIBRARY_FRAGMENT(torchtext, m) {
       .def(torch::init<std::string>())
       .def("Encode", &SentencePiece::Encode)
       .def("EncodeAsIds", &SentencePiece::EncodeAsIds)
+      .def("BatchEncodeAsIds", &SentencePiece::BatchEncodeAsIds)
       .def("DecodeIds", &SentencePiece::DecodeIds)
       .def("EncodeAsPieces", &SentencePiece::EncodeAsPieces)
       .def("DecodePieces", &SentencePiece::DecodePieces)
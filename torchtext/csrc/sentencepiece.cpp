@@ -22,6 +22,16 @@ std::vector<int64_t> SentencePiece::EncodeAsIds(
   return std::vector<int64_t>(val.begin(), val.end());
 }
 
+std::vector<std::vector<int64_t>> SentencePiece::BatchEncodeAsIds(
+    const std::vector<std::string>& inputs) const {
+  std::vector<std::vector<int64_t>> output;
+  output.reserve(inputs.size());
+  for (const auto& input : inputs) {
+    output.push_back(EncodeAsIds(input));
+  }
+  return output;
+}
+
 std::string SentencePiece::DecodeIds(const std::vector<int64_t>& ids) const {
   const std::vector<int> val(ids.begin(), ids.end());
   return processor_.DecodeIds(val);
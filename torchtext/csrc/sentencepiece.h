@@ -21,6 +21,8 @@ struct SentencePiece : torch::CustomClassHolder {
   TORCHTEXT_API std::vector<std::string> Encode(const std::string& input) const;
   TORCHTEXT_API std::vector<int64_t> EncodeAsIds(
       const std::string& input) const;
+  TORCHTEXT_API std::vector<std::vector<int64_t>> BatchEncodeAsIds(
+      const std::vector<std::string>& inputs) const;
   TORCHTEXT_API std::string DecodeIds(const std::vector<int64_t>& ids) const;
   TORCHTEXT_API std::vector<std::string> EncodeAsPieces(
       const std::string& input) const;
@@ -6,6 +6,7 @@
 #include <torchtext/csrc/vectors.h> // @manual
 #include <atomic>
 #include <condition_variable>
+#include <exception>
 #include <future>
 #include <iostream>
 #include <mutex>
@@ -44,7 +45,6 @@ Vectors::Vectors(
   }
 
   stoi_.reserve(tokens.size());
-  stovec_.reserve(tokens.size());
   for (std::size_t i = 0; i < tokens.size(); i++) {
     // tokens should not have any duplicates
     const auto& item_index = stoi_.find(tokens[i]);
@@ -61,16 +61,10 @@ Vectors::Vectors(
 }
 
 torch::Tensor Vectors::__getitem__(const std::string& token) {
-  const auto& item = stovec_.find(token);
-  if (item != stovec_.end()) {
-    return item->second;
-  }
-
   const auto& item_index = stoi_.find(token);
   if (item_index != stoi_.end()) {
-    auto vector = vectors_[item_index->second];
-    stovec_[token] = vector;
-    return vector;
+    // a view on the row, the vectors stay in the single contiguous matrix
+    return vectors_[item_index->second];
   }
   return unk_tensor_;
 }
@@ -88,11 +82,9 @@ void Vectors::__setitem__(
     const torch::Tensor& vector) {
   const auto& item_index = stoi_.find(token);
   if (item_index != stoi_.end()) {
-    stovec_[token] = vector;
     vectors_[item_index->second] = vector;
   } else {
     stoi_[token] = vectors_.size(0);
-    stovec_[token] = vector;
     // TODO: This could be done lazily during serialization (if necessary).
     // We would cycle through the vectors and concatenate those that aren't
     // views.
@@ -101,7 +93,7 @@ void Vectors::__setitem__(
 }
 
 int64_t Vectors::__len__() {
-  return stovec_.size();
+  return stoi_.size();
 }
 
 std::unordered_map<std::string, int64_t> Vectors::get_stoi() {
@@ -123,12 +115,18 @@ std::tuple<int64_t, int64_t, int64_t> _infer_shape(
   std::vector<std::string> vec_str;
   std::string line, word;
 
+  // declared before the stream so that it outlives it
+  std::vector<char> buffer;
   std::ifstream fin;
-  fin.open(file_path, std::ios::in);
+  impl::open_buffered_file(fin, buffer, file_path);
 
   while (std::getline(fin, line)) {
     vec_str.clear();
     if (vector_dim == -1) {
+      // the file is read in binary mode, drop the '\r' of CRLF line endings
+      if (!line.empty() && line.back() == '\r') {
+        line.pop_back();
+      }
       std::istringstream s(line);
 
       // get rid of the token
@@ -162,32 +160,53 @@ void parse_vectors_chunk(
     const char delimiter,
     std::shared_ptr<StringList> tokens,
     float* data_ptr) {
+  // declared before the stream so that it outlives it
+  std::vector<char> buffer;
   std::ifstream fin;
-  fin.open(file_path, std::ios::in);
+  impl::open_buffered_file(fin, buffer, file_path);
   fin.seekg(offset);
 
   int converter_flags = double_conversion::StringToDoubleConverter::NO_FLAGS;
   double_conversion::StringToDoubleConverter converter(
       converter_flags, 0.0f, double_conversion::Single::NaN(), NULL, NULL);
 
+  const auto is_blank = [](const char c) {
+    return c == ' ' || c == '\t' || c == '\r';
+  };
+
+  std::string line;
   for (int64_t i = start_line; i < end_line; i++) {
     std::string token;
     // read the token
     std::getline(fin, token, delimiter);
-    tokens->push_back(token);
+    tokens->push_back(std::move(token));
 
-    std::string vec_val;
+    // read the vector: the values are converted in place from the line
+    // buffer, without allocating a string per value
+    std::getline(fin, line);
+    const char* ptr = line.data();
+    const char* line_end = ptr + line.size();
     int processed_characters_count;
-    // read the vector
     for (int64_t j = 0; j < vector_dim; j++) {
-      fin >> vec_val;
-      const char* tmp_str = vec_val.c_str();
-      data_ptr[i * vector_dim + j] = converter.StringToFloat(
-          tmp_str, strlen(tmp_str), &processed_characters_count);
+      while (ptr < line_end && is_blank(*ptr)) {
+        ptr++;
+      }
+      const char* val_end = ptr;
+      while (val_end < line_end && !is_blank(*val_end)) {
+        val_end++;
+      }
+      const int val_length = static_cast<int>(val_end - ptr);
+      TORCH_CHECK(
+          val_length > 0,
+          "Expected " + std::to_string(vector_dim) +
+              " values for the vector at line " + std::to_string(i) + ".");
+      data_ptr[i * vector_dim + j] =
+          converter.StringToFloat(ptr, val_length, &processed_characters_count);
       TORCH_CHECK(
-          processed_characters_count == strlen(tmp_str),
+          processed_characters_count == val_length,
           "Processed characters count didn't match vector string "
           "length during string to float conversion!");
+      ptr = val_end;
     }
     fin >> std::ws;
   }
@@ -253,6 +272,8 @@ std::tuple<Vectors, std::vector<std::string>> _load_token_and_vectors_from_file(
   std::mutex m;
   std::condition_variable cv;
   std::atomic<int> counter(0);
+  // the first error raised by a thread, rethrown once every thread is done
+  std::exception_ptr error;
 
   // create threads
   int64_t j = 0;
@@ -270,16 +291,26 @@ std::tuple<Vectors, std::vector<std::string>> _load_token_and_vectors_from_file(
                 i,
                 tokens_ptr,
                 data_ptr]() {
-      parse_vectors_chunk(
-          file_path,
-          offsets[j],
-          i,
-          std::min(num_lines, i + chunk_size),
-          vector_dim,
-          delimiter,
-          tokens_ptr,
-          data_ptr);
+      std::exception_ptr chunk_error;
+      try {
+        parse_vectors_chunk(
+            file_path,
+            offsets[j],
+            i,
+            std::min(num_lines, i + chunk_size),
+            vector_dim,
+            delimiter,
+            tokens_ptr,
+            data_ptr);
+      } catch (...) {
+        // the thread pool drops exceptions, so the counter has to be
+        // decremented even when the chunk fails to parse
+        chunk_error = std::current_exception();
+      }
       std::lock_guard<std::mutex> lk(m);
+      if (chunk_error && !error) {
+        error = chunk_error;
+      }
       counter--;
       cv.notify_all();
     });
@@ -290,6 +321,9 @@ std::tuple<Vectors, std::vector<std::string>> _load_token_and_vectors_from_file(
   // block until all threads finish execution
   std::unique_lock<std::mutex> lock(m);
   cv.wait(lock, [&counter] { return counter == 0; });
+  if (error) {
+    std::rethrow_exception(error);
+  }
 
   IndexMap stoi;
   StringList dup_tokens;
@@ -4,8 +4,6 @@
 namespace torchtext {
 
 typedef std::vector<std::string> StringList;
-typedef ska_ordered::order_preserving_flat_hash_map<std::string, torch::Tensor>
-    VectorsMap;
 typedef ska_ordered::order_preserving_flat_hash_map<std::string, int64_t>
     IndexMap;
 typedef std::tuple<
@@ -18,8 +16,8 @@ typedef std::tuple<
 struct Vectors : torch::CustomClassHolder {
  public:
   const std::string version_str_ = "0.0.1";
+  // token -> row index into the contiguous (num_vectors, vector_dim) matrix
   IndexMap stoi_;
-  VectorsMap stovec_;
   torch::Tensor vectors_;
   torch::Tensor unk_tensor_;
 
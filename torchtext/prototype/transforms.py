@@ -261,6 +261,19 @@ class SentencePieceProcessor(nn.Module):
 
         return self.sp_model.EncodeAsIds(line)
 
+    @torch.jit.export
+    def batch_encode(self, lines: List[str]) -> List[List[int]]:
+        r"""
+        Args:
+            lines: a list of input sentence strings, encoded with a single call into the sentencepiece model
+
+        Examples:
+            >>> spm_processor.batch_encode(['the pretrained sp model names', 'the pretrained sp model names'])
+            >>> [[9, 1546, 18811, 2849, 2759, 2202], [9, 1546, 18811, 2849, 2759, 2202]]
+        """
+
+        return self.sp_model.BatchEncodeAsIds(lines)
+
     @torch.jit.export
     def decode(self, ids: List[int]) -> str:
         r"""
@@ -310,6 +323,34 @@ class VocabTransform(nn.Module):
 
         return self.vocab.lookup_indices(tokens)
 
+    @torch.jit.export
+    def forward_list(self, tokens: List[str]) -> List[int]:
+        r"""Look up the indices of a list of tokens with a single call into the vocab.
+
+        Args:
+            tokens: a string token list
+
+        Example:
+            >>> vocab_transform.forward_list(['here', 'is', 'an', 'example'])
+
+        """
+
+        return self.vocab.lookup_indices(tokens)
+
+    @torch.jit.export
+    def forward_str(self, token: str) -> int:
+        r"""Look up the index of a single token.
+
+        Args:
+            token: a string token
+
+        Example:
+            >>> vocab_transform.forward_str('example')
+
+        """
+
+        return self.vocab.__getitem__(token)
+
 
 class VectorTransform(nn.Module):
     r"""Vector transform
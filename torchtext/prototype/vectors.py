@@ -1,18 +1,26 @@
+import contextlib
 import logging
+import os
+import shutil
+import threading
+import zipfile
 from typing import List
 
+import numpy as np
 import torch
 import torch.nn as nn
 from torch import Tensor
 from torchtext._torchtext import _load_token_and_vectors_from_file, Vectors as VectorsPybind
-from torchtext.utils import download_from_url, extract_archive
+from torchtext.utils import _check_hash, download_from_url
 
 __all__ = ["FastText", "GloVe", "load_vectors_from_file_path", "build_vectors", "Vectors"]
 
 logger = logging.getLogger(__name__)
 
 
-def FastText(language="en", unk_tensor=None, root=".data", validate_file=True, num_cpus=32):
+def FastText(
+    language="en", unk_tensor=None, root=".data", validate_file=True, num_cpus=32, binary_cache=False, file_path=None
+):
     r"""Create a FastText Vectors object.
 
     Args:
@@ -23,6 +31,10 @@ def FastText(language="en", unk_tensor=None, root=".data", validate_file=True, n
         validate_file (bool): flag to determine whether to validate the downloaded files checksum.
                               Should be `False` when running tests with a local asset.
         num_cpus (int): the number of cpus to use when loading the vectors from file. Default: 10.
+        binary_cache (bool): flag to determine whether to store the parsed vectors in `root` in a binary format,
+                             which is memory-mapped on subsequent loads. Default: False.
+        file_path (str): path to a local copy of the FastText vectors file. When set, the file is read in place
+                         instead of being downloaded into `root`. Default: None.
 
     Returns:
         torchtext.experimental.vectors.Vector: a Vectors object.
@@ -37,17 +49,38 @@ def FastText(language="en", unk_tensor=None, root=".data", validate_file=True, n
     if validate_file:
         checksum = CHECKSUMS_FAST_TEXT.get(url, None)
 
-    downloaded_file_path = download_from_url(url, root=root, hash_value=checksum)
+    if file_path is None:
+        downloaded_file_path = download_from_url(url, root=root, hash_value=checksum)
+    else:
+        downloaded_file_path = file_path
+        if checksum:
+            _check_hash(downloaded_file_path, checksum, "sha256")
+
+    if binary_cache and _has_binary_cache(downloaded_file_path, root):
+        return Vectors(_load_binary_cache(downloaded_file_path, root, unk_tensor))
+
     cpp_vectors_obj, dup_tokens = _load_token_and_vectors_from_file(downloaded_file_path, " ", num_cpus, unk_tensor)
 
     if dup_tokens:
         raise ValueError("Found duplicate tokens in file: {}".format(str(dup_tokens)))
 
+    if binary_cache:
+        _save_binary_cache(cpp_vectors_obj, downloaded_file_path, root)
+
     vectors_obj = Vectors(cpp_vectors_obj)
     return vectors_obj
 
 
-def GloVe(name="840B", dim=300, unk_tensor=None, root=".data", validate_file=True, num_cpus=32):
+def GloVe(
+    name="840B",
+    dim=300,
+    unk_tensor=None,
+    root=".data",
+    validate_file=True,
+    num_cpus=32,
+    binary_cache=False,
+    file_path=None,
+):
     r"""Create a GloVe Vectors object.
 
     Args:
@@ -85,6 +118,11 @@ def GloVe(name="840B", dim=300, unk_tensor=None, root=".data", validate_file=Tru
         validate_file (bool): flag to determine whether to validate the downloaded files checksum.
                               Should be `False` when running tests with a local asset.
         num_cpus (int): the number of cpus to use when loading the vectors from file. Default: 10.
+        binary_cache (bool): flag to determine whether to store the parsed vectors in `root` in a binary format,
+                             which is memory-mapped on subsequent loads. Default: False.
+        file_path (str): path to a local copy of the GloVe zip archive. When set, the archive is read in place
+                         instead of being downloaded, and only the file for `dim` is extracted into `root`.
+                         Default: None.
     Returns:
         torchtext.experimental.vectors.Vector: a Vectors object.
 
@@ -130,10 +168,18 @@ def GloVe(name="840B", dim=300, unk_tensor=None, root=".data", validate_file=Tru
     if validate_file:
         checksum = CHECKSUMS_GLOVE.get(url, None)
 
-    downloaded_file_path = download_from_url(url, root=root, hash_value=checksum)
-    extracted_file_paths = extract_archive(downloaded_file_path)
-    # need to get the full path to the correct file in the case when multiple files are extracted with different dims
-    extracted_file_path_with_correct_dim = [path for path in extracted_file_paths if file_name in path][0]
+    if file_path is None:
+        downloaded_file_path = download_from_url(url, root=root, hash_value=checksum)
+    else:
+        downloaded_file_path = file_path
+        if checksum:
+            _check_hash(downloaded_file_path, checksum, "sha256")
+
+    # the archives of some datasets contain one file per dim, only extract the one that is needed
+    extracted_file_path_with_correct_dim = _extract_zip_member(downloaded_file_path, file_name, root)
+    if binary_cache and _has_binary_cache(extracted_file_path_with_correct_dim, root):
+        return Vectors(_load_binary_cache(extracted_file_path_with_correct_dim, root, unk_tensor))
+
     cpp_vectors_obj, dup_tokens = _load_token_and_vectors_from_file(
         extracted_file_path_with_correct_dim, " ", num_cpus, unk_tensor
     )
@@ -142,10 +188,159 @@ def GloVe(name="840B", dim=300, unk_tensor=None, root=".data", validate_file=Tru
     if dup_tokens and dup_tokens != dup_token_glove_840b:
         raise ValueError("Found duplicate tokens in file: {}".format(str(dup_tokens)))
 
+    if binary_cache:
+        _save_binary_cache(cpp_vectors_obj, extracted_file_path_with_correct_dim, root)
+
     vectors_obj = Vectors(cpp_vectors_obj)
     return vectors_obj
 
 
+# zip archives opened by the loads in progress, keyed by absolute path
+_zip_archives = {}
+_zip_archives_lock = threading.Lock()
+
+
+class _SharedZipFile:
+    def __init__(self, archive_path, stamp) -> None:
+        self.zfile = zipfile.ZipFile(archive_path, "r")
+        self.stamp = stamp
+        self.num_users = 0
+
+
+@contextlib.contextmanager
+def _open_zip_archive(archive_path):
+    r"""Open the ZipFile of `archive_path`, sharing it with the other loads of that archive in progress.
+
+    Concurrent loads parse the central directory only once. The archive is closed when the last of them is done,
+    so that no file descriptor outlives the loads. An archive that changed on disk is opened again, and the replaced
+    ZipFile is closed once the loads still reading from it are done.
+    """
+    archive_path = os.path.abspath(archive_path)
+    stat = os.stat(archive_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _zip_archives_lock:
+        shared = _zip_archives.get(archive_path)
+        if shared is None or shared.stamp != stamp:
+            shared = _SharedZipFile(archive_path, stamp)
+            _zip_archives[archive_path] = shared
+        shared.num_users += 1
+    try:
+        yield shared.zfile
+    finally:
+        with _zip_archives_lock:
+            shared.num_users -= 1
+            if shared.num_users == 0:
+                shared.zfile.close()
+                if _zip_archives.get(archive_path) is shared:
+                    del _zip_archives[archive_path]
+
+
+def _extract_zip_member(archive_path, file_name, to_path):
+    r"""Extract the single file named `file_name` from the zip archive `archive_path` into `to_path`.
+
+    The member is streamed out of the archive, so the other members are never decompressed. An already
+    extracted file is reused. Returns the path to the extracted file.
+    """
+    with _open_zip_archive(archive_path) as zfile:
+        members = [member for member in zfile.namelist() if os.path.basename(member) == file_name]
+        if not members:
+            raise ValueError("Could not find {} in archive {}.".format(file_name, archive_path))
+
+        extracted_file_path = os.path.join(to_path, members[0])
+        # reject member names that would be written outside of to_path, such as absolute paths or ".." components
+        real_to_path = os.path.realpath(to_path)
+        if os.path.commonpath([real_to_path, os.path.realpath(extracted_file_path)]) != real_to_path:
+            raise ValueError(
+                "Refusing to extract {} from archive {} outside of {}.".format(members[0], archive_path, to_path)
+            )
+
+        if os.path.exists(extracted_file_path):
+            logger.info("{} already extracted.".format(extracted_file_path))
+            return extracted_file_path
+
+        logger.info("Extracting {} from {}.".format(members[0], archive_path))
+        os.makedirs(os.path.dirname(extracted_file_path), exist_ok=True)
+        # a temporary name unique to this thread, so that concurrent extractions of the same member don't collide
+        tmp_path = "{}.{}.{}.tmp".format(extracted_file_path, os.getpid(), threading.get_ident())
+        with zfile.open(members[0]) as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, extracted_file_path)
+        return extracted_file_path
+
+
+def _cached_binary_path(file_path, cache_dir):
+    r"""Return the paths in `cache_dir` of the binary vectors file and its token file cached for the text file
+    `file_path`."""
+    cached_file_path = os.path.join(cache_dir, os.path.basename(file_path))
+    return cached_file_path + ".bin", cached_file_path + ".vocab.txt"
+
+
+def _has_binary_cache(file_path, cache_dir):
+    r"""Check whether an up to date binary cache of the text file `file_path` exists in `cache_dir`."""
+    bin_path, vocab_path = _cached_binary_path(file_path, cache_dir)
+    if not (os.path.exists(bin_path) and os.path.exists(vocab_path)):
+        return False
+    return os.path.getmtime(bin_path) >= os.path.getmtime(file_path)
+
+
+# alignment in bytes of the first row of a binary cache
+_BINARY_CACHE_ALIGNMENT = 64
+
+
+def _save_binary_cache(cpp_vectors_obj, file_path, cache_dir):
+    r"""Write the vectors loaded from `file_path` into `cache_dir` in a word2vec like binary format.
+
+    The binary file holds a `"<num_vectors> <vector_dim>\n"` header followed by the `float32` rows, while the
+    tokens are stored one per line in a parallel file so that line `i` corresponds to row `i`. The header is padded
+    with spaces to a multiple of `_BINARY_CACHE_ALIGNMENT` bytes, so that the memory-mapped rows are aligned.
+    """
+    stoi = cpp_vectors_obj.get_stoi()
+    if not stoi:
+        return
+
+    tokens = list(stoi.keys())
+    indices = torch.tensor(list(stoi.values()), dtype=torch.long)
+    matrix = cpp_vectors_obj.vectors_.index_select(0, indices).contiguous().numpy()
+
+    bin_path, vocab_path = _cached_binary_path(file_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    logger.info("Caching vectors from {} to {}".format(file_path, bin_path))
+    # write to temporary files first so that concurrent loaders never observe a partially written cache
+    with open(vocab_path + ".tmp", "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(tokens))
+    with open(bin_path + ".tmp", "wb") as f:
+        header = "{} {}".format(matrix.shape[0], matrix.shape[1])
+        header += " " * (-(len(header) + 1) % _BINARY_CACHE_ALIGNMENT) + "\n"
+        f.write(header.encode("ascii"))
+        matrix.astype(np.float32, copy=False).tofile(f)
+    os.replace(vocab_path + ".tmp", vocab_path)
+    os.replace(bin_path + ".tmp", bin_path)
+
+
+def _load_binary_cache(file_path, cache_dir, unk_tensor=None):
+    r"""Memory-map the binary cache of `file_path` written by `_save_binary_cache` into a cpp vectors object."""
+    bin_path, vocab_path = _cached_binary_path(file_path, cache_dir)
+    logger.info("Loading cached vectors from {}".format(bin_path))
+    with open(bin_path, "rb") as f:
+        header = f.readline()
+    num_vectors, vector_dim = [int(x) for x in header.split()]
+
+    with open(vocab_path, "r", encoding="utf-8", newline="\n") as f:
+        tokens = f.read().split("\n")
+    if len(tokens) != num_vectors:
+        raise RuntimeError(
+            "Expected {} tokens in {} but found {}. Delete the cached files and retry.".format(
+                num_vectors, vocab_path, len(tokens)
+            )
+        )
+
+    # copy-on-write mapping: the rows are paged in lazily and `__setitem__` never writes back to the cache
+    matrix = np.memmap(bin_path, dtype=np.float32, mode="c", offset=len(header), shape=(num_vectors, vector_dim))
+    vectors = torch.from_numpy(matrix)
+    unk_tensor = unk_tensor if unk_tensor is not None else torch.zeros(vector_dim, dtype=torch.float)
+    return VectorsPybind(tokens, list(range(num_vectors)), vectors, unk_tensor)
+
+
 def load_vectors_from_file_path(filepath, delimiter=",", unk_tensor=None, num_cpus=10):
     r"""Create a Vectors object from a csv file path.
 
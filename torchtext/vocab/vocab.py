@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import torch
 import torch.nn as nn
@@ -157,6 +157,18 @@ class Vocab(nn.Module):
         """
         return self.vocab.get_itos()
 
+    def __iter__(self) -> Iterator[str]:
+        r"""
+        Returns:
+            Iterator over the tokens in index order. Unlike `get_itos`, the tokens are converted one at a time
+            instead of copying the whole list, and adding tokens to the vocab while iterating raises a
+            `RuntimeError`. A scripted vocab iterates over a `get_itos` snapshot instead, which is not affected by
+            later changes to the vocab.
+        """
+        if self.is_jitable:
+            return iter(self.vocab.get_itos())
+        return iter(self.vocab)
+
     def __prepare_scriptable__(self):
         r"""Return a JITable Vocab."""
         if not self.is_jitable: